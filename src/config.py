@@ -21,14 +21,42 @@ class Config:
     HOST = '0.0.0.0'
     
     # Polling configuration
-    POLL_INTERVAL = 300  # 5 minutes in seconds
+    POLL_INTERVAL = int(os.getenv('POLL_INTERVAL', 300))  # 5 minutes in seconds
+    
+    # Optional JSON/YAML file with feeds, routes, rules and intervals; it is
+    # watched for changes and applied without a restart
+    CONFIG_FILE = os.getenv('CONFIG_FILE')
+    CONFIG_CHECK_INTERVAL = float(os.getenv('CONFIG_CHECK_INTERVAL', 5))  # seconds
     
     # Logging configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
+    # Dependency protection configuration
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 60))  # seconds
+    TIMEOUT_MIN = float(os.getenv('TIMEOUT_MIN', 2))  # seconds
+    TIMEOUT_MAX = float(os.getenv('TIMEOUT_MAX', 30))  # seconds
+    
+    # Load shedding: alerts beyond this many per cycle are sent as a digest
+    SHED_WATERMARK = int(os.getenv('SHED_WATERMARK', 25))
+    DIGEST_MAX_ITEMS = int(os.getenv('DIGEST_MAX_ITEMS', 30))
+    
+    # Profiling configuration (opt-in)
+    PROFILE_ENABLED = os.getenv('PROFILE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    PROFILE_THRESHOLD = float(os.getenv('PROFILE_THRESHOLD', 60))  # seconds
+    PROFILE_DIR = os.getenv('PROFILE_DIR', '/tmp/keepa-alerts-profiles')
+    PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', 20))
+    
+    # Admin endpoints are only served when a token is configured
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+    
     @classmethod
     def validate(cls):
         """Validate required configuration"""
+        if cls.CONFIG_FILE:
+            # Feeds and webhooks come from the configuration file
+            return
+        
         if not cls.SLACK_WEBHOOK_URL:
             raise ValueError("SLACK_WEBHOOK_URL environment variable is required")
         
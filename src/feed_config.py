@@ -0,0 +1,228 @@
+"""File-based feed, routing and interval configuration with hot reload"""
+
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:  # YAML support is optional, JSON always works
+    yaml = None
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUTE = 'default'
+MIN_POLL_INTERVAL = 30  # seconds
+
+
+class ConfigError(ValueError):
+    """Raised when a configuration file is missing fields or has invalid values"""
+
+
+@dataclass(frozen=True)
+class Rules:
+    """Title keyword filters applied to a feed's alerts (case-insensitive)"""
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+
+    def matches(self, title: str) -> bool:
+        title = title.lower()
+        if self.include and not any(word in title for word in self.include):
+            return False
+        return not any(word in title for word in self.exclude)
+
+
+@dataclass(frozen=True)
+class Route:
+    """A Slack destination alerts can be sent to"""
+    name: str
+    webhook_url: str
+
+
+@dataclass(frozen=True)
+class FeedConfig:
+    """A Keepa RSS feed and how it is polled and routed"""
+    name: str
+    url: str
+    poll_interval: int
+    route: str = DEFAULT_ROUTE
+    rules: Rules = field(default_factory=Rules)
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """A complete, validated configuration snapshot"""
+    poll_interval: int
+    feeds: Tuple[FeedConfig, ...]
+    routes: Dict[str, Route] = field(default_factory=dict, hash=False)
+
+    def route_for(self, feed: FeedConfig) -> Route:
+        return self.routes[feed.route]
+
+
+def default_config() -> RuntimeConfig:
+    """Build the single-feed configuration described by environment variables"""
+    return RuntimeConfig(
+        poll_interval=Config.POLL_INTERVAL,
+        feeds=(FeedConfig(name=DEFAULT_ROUTE, url=Config.KEEPA_RSS_URL, poll_interval=Config.POLL_INTERVAL),),
+        routes={DEFAULT_ROUTE: Route(name=DEFAULT_ROUTE, webhook_url=Config.SLACK_WEBHOOK_URL)}
+    )
+
+
+def _interval(value, where: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ConfigError(f"{where}: poll_interval must be a number of seconds")
+    if value < MIN_POLL_INTERVAL:
+        raise ConfigError(f"{where}: poll_interval must be at least {MIN_POLL_INTERVAL} seconds")
+    return int(value)
+
+
+def _keywords(value, where: str) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(word, str) for word in value):
+        raise ConfigError(f"{where} must be a string or list of strings")
+    return tuple(word.lower() for word in value if word)
+
+
+def _parse_routes(data) -> Dict[str, Route]:
+    if not isinstance(data, dict):
+        raise ConfigError("routes must be a mapping of route name to settings")
+
+    routes = {}
+    for name, settings in data.items():
+        if not isinstance(settings, dict):
+            raise ConfigError(f"route '{name}' must be a mapping")
+        webhook_url = settings.get('webhook_url')
+        if not webhook_url and settings.get('webhook_url_env'):
+            webhook_url = os.getenv(settings['webhook_url_env'])
+            if not webhook_url:
+                raise ConfigError(f"route '{name}': environment variable {settings['webhook_url_env']} is not set")
+        if not webhook_url or not str(webhook_url).startswith('https://'):
+            raise ConfigError(f"route '{name}': webhook_url must be an https URL")
+        routes[name] = Route(name=name, webhook_url=webhook_url)
+
+    if DEFAULT_ROUTE not in routes and Config.SLACK_WEBHOOK_URL:
+        routes[DEFAULT_ROUTE] = Route(name=DEFAULT_ROUTE, webhook_url=Config.SLACK_WEBHOOK_URL)
+    return routes
+
+
+def parse_config(data) -> RuntimeConfig:
+    """Validate raw configuration data and build a RuntimeConfig"""
+    if not isinstance(data, dict):
+        raise ConfigError("configuration must be a mapping")
+
+    poll_interval = _interval(data.get('poll_interval', Config.POLL_INTERVAL), "poll_interval")
+    routes = _parse_routes(data.get('routes', {}))
+
+    feeds_data = data.get('feeds')
+    if not isinstance(feeds_data, list) or not feeds_data:
+        raise ConfigError("feeds must be a non-empty list")
+
+    feeds = []
+    for index, settings in enumerate(feeds_data):
+        if not isinstance(settings, dict):
+            raise ConfigError(f"feeds[{index}] must be a mapping")
+        if settings.get('enabled', True) is False:
+            continue
+
+        name = settings.get('name')
+        if not name or not isinstance(name, str):
+            raise ConfigError(f"feeds[{index}]: name is required")
+        if any(feed.name == name for feed in feeds):
+            raise ConfigError(f"feed '{name}' is defined more than once")
+
+        url = settings.get('url')
+        if not url or not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+            raise ConfigError(f"feed '{name}': url must be an http(s) URL")
+
+        route = settings.get('route', DEFAULT_ROUTE)
+        if route not in routes:
+            raise ConfigError(f"feed '{name}': unknown route '{route}'")
+
+        rules_data = settings.get('rules') or {}
+        if not isinstance(rules_data, dict):
+            raise ConfigError(f"feed '{name}': rules must be a mapping")
+
+        feeds.append(FeedConfig(
+            name=name,
+            url=url,
+            poll_interval=_interval(settings.get('poll_interval', poll_interval), f"feed '{name}'"),
+            route=route,
+            rules=Rules(
+                include=_keywords(rules_data.get('include'), f"feed '{name}': rules.include"),
+                exclude=_keywords(rules_data.get('exclude'), f"feed '{name}': rules.exclude")
+            )
+        ))
+
+    return RuntimeConfig(poll_interval=poll_interval, feeds=tuple(feeds), routes=routes)
+
+
+def load_config(path: str) -> RuntimeConfig:
+    """Read and validate a JSON or YAML configuration file"""
+    try:
+        with open(path) as f:
+            text = f.read()
+    except OSError as e:
+        raise ConfigError(f"cannot read {path}: {e}")
+
+    if path.endswith(('.yml', '.yaml')):
+        if yaml is None:
+            raise ConfigError(f"{path} is YAML but PyYAML is not installed")
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ConfigError(f"invalid YAML in {path}: {e}")
+    else:
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise ConfigError(f"invalid JSON in {path}: {e}")
+
+    return parse_config(data)
+
+
+class ConfigWatcher:
+    """Polls a configuration file's mtime and reloads it when it changes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._signature: Optional[Tuple[float, int]] = None
+
+    def _stat(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load(self) -> RuntimeConfig:
+        """Load the file unconditionally; raises ConfigError if it is invalid"""
+        self._signature = self._stat()
+        return load_config(self.path)
+
+    def poll(self) -> Optional[RuntimeConfig]:
+        """Return a new configuration if the file changed and is valid, else None"""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+
+        self._signature = signature
+        try:
+            config = load_config(self.path)
+        except ConfigError as e:
+            logger.error(f"Ignoring invalid configuration change: {e}")
+            return None
+
+        logger.info(f"Loaded configuration change from {self.path}")
+        return config
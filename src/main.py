@@ -1,20 +1,23 @@
 """Main Flask application for Keepa to Slack Alert Service"""
 
+import hmac
 import time
 import threading
 import sys
 import os
 from datetime import datetime
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, send_file, abort
 import logging
-from typing import Set
+from typing import Dict, List, Optional, Set, Tuple
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import Config
+from feed_config import ConfigWatcher, FeedConfig, default_config
+from scheduler import FeedScheduler
 from slack_service import SlackService
-from rss_service import RSSService
+from profiling import CycleProfiler, span
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
@@ -37,36 +40,53 @@ app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 import logging
 logging.getLogger('flask').setLevel(logging.CRITICAL)
 
-# Global set to track sent alerts
-sent_alerts: Set[str] = set()
+# Global set to track sent alerts, keyed by (webhook URL, alert id) so the
+# same product in feeds routed to different channels reaches each of them
+sent_alerts: Set[Tuple[str, str]] = set()
 
-# Initialize services
-slack_service = SlackService()
-rss_service = RSSService()
+# Initialize services; create_app swaps in the configuration file if one is set
+feed_scheduler = FeedScheduler(default_config())
+config_watcher = ConfigWatcher(Config.CONFIG_FILE) if Config.CONFIG_FILE else None
+cycle_profiler = CycleProfiler()
+
+# Set to make run_scheduled_check return after the feed it is polling
+scheduler_stop = threading.Event()
+
+
+def is_high_priority(alert) -> bool:
+    """Alerts with a parsed price are sent individually ahead of the rest"""
+    return bool(alert.get('price')) and alert['price'] != "Price not specified"
 
 
 def check_and_send_alerts():
-    """Check for new alerts and send notifications"""
-    global sent_alerts
-    
-    alerts = rss_service.parse_keepa_rss()
-    new_alerts_count = 0
+    """Check every configured feed for new alerts and send notifications"""
+    return check_feeds(feed_scheduler.feeds())
+
+
+def check_feed(feed: FeedConfig):
+    """Check one feed for new alerts and send them to its route"""
+    return check_feeds([feed])
+
+
+def check_feeds(feeds: List[FeedConfig]):
+    """Check feeds for new alerts and deliver them as one backlog.
+
+    A feed that fails is logged and skipped so it cannot hold up the
+    others. Returns the number of alerts sent.
+    """
+    batches = []
+    for feed in feeds:
+        if scheduler_stop.is_set():
+            break
+        try:
+            batch = collect_new_alerts(feed)
+        except Exception as e:
+            logger.error(f"Error checking feed {feed.name}: {e}")
+            continue
+        if batch is not None:
+            batches.append(batch)
     
-    for alert in alerts:
-        alert_id = alert['id']
-        
-        if alert_id not in sent_alerts:
-            success = slack_service.send_notification(
-                title=alert['title'],
-                link=alert['link'],
-                price=alert['price'],
-                description=alert['description'],
-                image_url=alert.get('image_url')
-            )
-            
-            if success:
-                sent_alerts.add(alert_id)
-                new_alerts_count += 1
+    new_alerts_count = deliver_alerts(batches)
     
     if new_alerts_count > 0:
         logger.info(f"Sent {new_alerts_count} new alerts to Slack")
@@ -76,17 +96,141 @@ def check_and_send_alerts():
     return new_alerts_count
 
 
+def collect_new_alerts(feed: FeedConfig) -> Optional[Tuple[SlackService, List[Dict]]]:
+    """Fetch a feed and return its notifier with the alerts not yet sent there"""
+    # Resolve services once so a concurrent reload cannot change them mid-poll
+    services = feed_scheduler.services_for(feed)
+    if services is None:
+        logger.info(f"Skipping feed {feed.name}, removed by a configuration reload")
+        return None
+    rss_service, slack_service = services
+    
+    alerts = rss_service.parse_keepa_rss()
+    
+    with span("filter", feed=feed.name, total=len(alerts)) as record:
+        alerts = [alert for alert in alerts if feed.rules.matches(alert['title'])]
+        if record is not None:
+            record["matched"] = len(alerts)
+    
+    with span("dedup", feed=feed.name, total=len(alerts)) as record:
+        new_alerts = [
+            alert for alert in alerts
+            if (slack_service.webhook_url, alert['id']) not in sent_alerts
+        ]
+        if record is not None:
+            record["new"] = len(new_alerts)
+    
+    return slack_service, new_alerts
+
+
+def deliver_alerts(batches: List[Tuple[SlackService, List[Dict]]]) -> int:
+    """Send a check's new alerts, shedding load once the backlog passes the watermark.
+    
+    The backlog spans every feed in the check: priced alerts go out
+    individually first, up to SHED_WATERMARK posts, and the overflow is
+    digested per webhook. Alerts that do not fit in a digest, or whose
+    webhook's circuit is open, stay new for the next check.
+    """
+    global sent_alerts
+    
+    backlog = {}
+    for slack_service, alerts in batches:
+        for alert in alerts:
+            backlog.setdefault((slack_service.webhook_url, alert['id']), (slack_service, alert))
+    queue = sorted(backlog.values(), key=lambda item: not is_high_priority(item[1]))
+    immediate = queue[:Config.SHED_WATERMARK]
+    overflow = queue[Config.SHED_WATERMARK:]
+    
+    sent = 0
+    unavailable = set()
+    for slack_service, alert in immediate:
+        if slack_service.webhook_url in unavailable or not slack_service.is_available():
+            unavailable.add(slack_service.webhook_url)
+            continue
+        
+        with span("slack_post", alert_id=alert['id']) as record:
+            try:
+                success = slack_service.send_notification(
+                    title=alert['title'],
+                    link=alert['link'],
+                    price=alert['price'],
+                    description=alert['description'],
+                    image_url=alert.get('image_url')
+                )
+            except Exception as e:
+                logger.error(f"Error sending alert {alert['id']}: {e}")
+                success = False
+            if record is not None:
+                record["success"] = success
+        
+        if success:
+            sent_alerts.add((slack_service.webhook_url, alert['id']))
+            sent += 1
+    
+    if unavailable:
+        logger.warning(f"Slack circuit open for {len(unavailable)} webhook(s), deferring their alerts to the next check")
+    
+    digests = {}
+    for slack_service, alert in overflow:
+        if slack_service.webhook_url not in unavailable:
+            digests.setdefault(slack_service.webhook_url, (slack_service, []))[1].append(alert)
+    
+    for slack_service, alerts in digests.values():
+        # Only the alerts listed in the digest count as sent; the rest stay
+        # new and are picked up by the next check
+        digest = alerts[:Config.DIGEST_MAX_ITEMS]
+        deferred = len(alerts) - len(digest)
+        logger.warning(
+            f"Backlog of {len(queue)} alerts over watermark, digesting {len(digest)}, "
+            f"deferring {deferred} to the next check"
+        )
+        with span("slack_digest", alerts=len(digest)):
+            if slack_service.send_digest(digest, remaining=deferred):
+                sent_alerts.update((slack_service.webhook_url, alert['id']) for alert in digest)
+                sent += len(digest)
+    
+    return sent
+
+
+def reload_config():
+    """Apply the configuration file if it changed since the last check"""
+    if config_watcher is None:
+        return
+    config = config_watcher.poll()
+    if config is not None:
+        feed_scheduler.apply(config)
+
+
 def run_scheduled_check():
-    """Run scheduled check every 5 minutes"""
-    while True:
+    """Poll feeds as they come due and pick up configuration changes"""
+    consecutive_errors = 0
+    while not scheduler_stop.is_set():
         try:
-            logger.info("Running scheduled alert check...")
-            check_and_send_alerts()
-            logger.info(f"Scheduled check completed. Waiting {Config.POLL_INTERVAL} seconds...")
-            time.sleep(Config.POLL_INTERVAL)
+            reload_config()
+            due_feeds = feed_scheduler.due()
+            if due_feeds:
+                logger.info(f"Running scheduled alert check for {len(due_feeds)} feed(s)...")
+                with cycle_profiler.cycle("scheduled"):
+                    # check_feeds skips failing feeds, which are retried at
+                    # their next regular poll rather than starving the others
+                    check_feeds(due_feeds)
+                for feed in due_feeds:
+                    feed_scheduler.mark_ran(feed)
+                consecutive_errors = 0
+            
+            delay = feed_scheduler.seconds_until_next()
+            if config_watcher is not None:
+                delay = min(delay, Config.CONFIG_CHECK_INTERVAL)
+            if due_feeds:
+                logger.info(f"Scheduled check completed. Waiting {delay:.0f} seconds...")
+            scheduler_stop.wait(delay)
         except Exception as e:
-            logger.error(f"Error in scheduled check: {e}")
-            time.sleep(60)  # Wait 1 minute before retrying
+            # Scheduler or reload failure: back off exponentially from 1 minute,
+            # capped at the poll interval
+            consecutive_errors += 1
+            delay = min(feed_scheduler.config.poll_interval, 60 * 2 ** (consecutive_errors - 1))
+            logger.error(f"Error in scheduled check: {e}. Retrying in {delay} seconds")
+            scheduler_stop.wait(delay)
 
 
 @app.route('/')
@@ -96,6 +240,7 @@ def health_check():
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "sent_alerts_count": len(sent_alerts),
+        "dependencies": feed_scheduler.status(),
         "version": "1.0.0"
     })
 
@@ -145,6 +290,7 @@ def webhook_receiver():
 def test_slack():
     """Test Slack integration"""
     try:
+        slack_service = feed_scheduler.notifiers()[0]
         success = slack_service.send_test_notification()
         return jsonify({
             "status": "success" if success else "error",
@@ -158,10 +304,44 @@ def test_slack():
         }), 500
 
 
+def require_admin_token():
+    """Reject admin requests unless the configured token is presented"""
+    if not Config.ADMIN_TOKEN:
+        abort(404)
+    token = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(token.encode('utf-8'), Config.ADMIN_TOKEN.encode('utf-8')):
+        abort(401)
+
+
+@app.route('/admin/profiles', methods=['GET'])
+def list_profiles():
+    """List stored profiles of slow polling cycles"""
+    require_admin_token()
+    return jsonify({
+        "enabled": cycle_profiler.enabled,
+        "threshold_seconds": cycle_profiler.threshold,
+        "profiles": cycle_profiler.list_profiles()
+    })
+
+
+@app.route('/admin/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """Download a stored profile as trace (json), stats (txt) or pstats (prof)"""
+    require_admin_token()
+    fmt = request.args.get('format', 'json')
+    path = cycle_profiler.profile_path(profile_id, f".{fmt}")
+    if not path:
+        abort(404)
+    return send_file(path, as_attachment=(fmt == 'prof'))
+
+
 def create_app():
     """Application factory"""
     try:
         Config.validate()
+        if config_watcher is not None:
+            feed_scheduler.apply(config_watcher.load())
+            logger.info(f"Loaded configuration from {Config.CONFIG_FILE}")
         logger.info("Starting Keepa to Slack alert service...")
         
         # Start the scheduled check in a background thread
@@ -0,0 +1,195 @@
+"""HTML to Slack mrkdwn conversion for Keepa alert descriptions"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tags whose boundaries should start a new line in the output
+BLOCK_TAGS = frozenset({
+    'br', 'p', 'div', 'tr', 'li', 'ul', 'ol', 'table',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr',
+})
+
+# Tags whose content is never shown to the user
+SKIPPED_TAGS = frozenset({'script', 'style', 'head', 'title'})
+
+# Maximum number of converted descriptions kept in memory
+CACHE_SIZE = 1024
+
+# Each token is (kind, text, href): kind is 'word', 'link' or 'newline'
+Token = Tuple[str, str, Optional[str]]
+
+
+class _MrkdwnParser(HTMLParser):
+    """Single-pass tokenizer turning HTML into words, links and line breaks"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tokens: List[Token] = []
+        self._skip_depth = 0
+        self._href: Optional[str] = None
+        self._link_text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == 'a':
+            self._close_link()
+            self._href = dict(attrs).get('href') or None
+            self._link_text = []
+        elif tag in BLOCK_TAGS:
+            self._newline()
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._newline()
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == 'a':
+            self._close_link()
+        elif tag in BLOCK_TAGS:
+            self._newline()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._href is not None:
+            self._link_text.append(data)
+            return
+        for word in data.split():
+            self.tokens.append(('word', word, None))
+
+    def close(self):
+        super().close()
+        self._close_link()
+
+    def _newline(self):
+        self._close_link()
+        self.tokens.append(('newline', '\n', None))
+
+    def _close_link(self):
+        if self._href is None:
+            return
+        text = ' '.join(''.join(self._link_text).split())
+        if self._href.startswith(('http://', 'https://', 'mailto:')):
+            self.tokens.append(('link', text or self._href, self._href))
+        else:
+            # Relative or javascript: links cannot be rendered by Slack
+            for word in text.split():
+                self.tokens.append(('word', word, None))
+        self._href = None
+        self._link_text = []
+
+
+def _escape(text: str) -> str:
+    """Escape the control characters Slack reserves in mrkdwn"""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def escape_url(url: str) -> str:
+    """Percent-encode the characters that would break a ``<url|text>`` link"""
+    return url.replace('|', '%7C').replace('>', '%3E').replace('<', '%3C')
+
+
+def _clip(text: str, limit: int) -> str:
+    """Escape as much of ``text`` as fits in ``limit`` rendered characters"""
+    parts: List[str] = []
+    length = 0
+    for char in text:
+        escaped = _escape(char)
+        if length + len(escaped) > limit:
+            break
+        parts.append(escaped)
+        length += len(escaped)
+    return ''.join(parts)
+
+
+def _render(tokens: List[Token], max_length: int) -> str:
+    """Join tokens into mrkdwn, truncating at a word or link boundary.
+
+    ``max_length`` bounds the rendered output, link URLs and escape
+    sequences included, not counting the trailing ellipsis.
+    """
+    parts: List[str] = []
+    length = 0
+    truncated = False
+
+    for kind, text, href in tokens:
+        if kind == 'newline':
+            if parts and parts[-1] != '\n':
+                parts.append('\n')
+                length += 1
+            continue
+
+        if kind == 'link':
+            rendered = f"<{escape_url(href)}|{_escape(text)}>"
+        else:
+            rendered = _escape(text)
+
+        separator = 1 if parts and parts[-1] != '\n' else 0
+        if max_length and length + separator + len(rendered) > max_length:
+            truncated = True
+            if not length:
+                # A single oversized word or link would otherwise leave nothing
+                # to show, so fall back to as much of its text as fits
+                parts.append(_clip(text, max_length))
+            break
+
+        if separator:
+            parts.append(' ')
+        parts.append(rendered)
+        length += separator + len(rendered)
+
+    result = ''.join(parts).strip()
+    if truncated:
+        result += "..."
+    return result
+
+
+_cache: "OrderedDict[Tuple[bytes, int], str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def html_to_mrkdwn(html: str, max_length: int = 300) -> str:
+    """Convert an HTML description to Slack mrkdwn.
+
+    Images and non-visible elements are dropped, entities are decoded,
+    absolute links are kept as ``<url|text>`` and the rendered output is
+    truncated to ``max_length`` characters without splitting a word or
+    link. Results are memoised by content hash since Keepa repeats the
+    same descriptions across polls.
+    """
+    if not html or not html.strip():
+        return ""
+
+    key = (hashlib.blake2b(html.encode('utf-8'), digest_size=16).digest(), max_length)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    parser = _MrkdwnParser()
+    try:
+        parser.feed(html)
+        parser.close()
+        tokens = parser.tokens
+    except Exception as e:
+        # html.parser raises (even AssertionError) on some malformed markup;
+        # show the raw text rather than failing the whole notification
+        logger.warning(f"Could not parse description HTML, sending it as text: {e!r}")
+        tokens = [('word', word, None) for word in html.split()]
+    result = _render(tokens, max_length)
+
+    with _cache_lock:
+        _cache[key] = result
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
@@ -0,0 +1,168 @@
+"""Opt-in profiling and span tracing for slow polling cycles"""
+
+import cProfile
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class CycleTrace:
+    """Span-style timings recorded during a single polling cycle"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+        self.spans: List[Dict] = []
+        self._depth = 0
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        start = time.perf_counter()
+        record = {
+            "name": name,
+            "depth": self._depth,
+            "offset_ms": round((start - self._start) * 1000, 3),
+        }
+        if attributes:
+            record["attributes"] = attributes
+        self.spans.append(record)
+        self._depth += 1
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = str(e)
+            raise
+        finally:
+            self._depth -= 1
+            record["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict:
+        return {
+            "cycle": self.name,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.elapsed() * 1000, 3),
+            "spans": self.spans,
+        }
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Record a span on the current thread's cycle trace, if any"""
+    trace: Optional[CycleTrace] = getattr(_local, 'trace', None)
+    if trace is None:
+        yield None
+        return
+    with trace.span(name, **attributes) as record:
+        yield record
+
+
+class CycleProfiler:
+    """Profiles polling cycles and keeps dumps of the ones that run long.
+
+    When enabled, each cycle runs under cProfile with a span trace. If the
+    cycle exceeds the latency threshold, the pstats output and the trace
+    are written to the profile directory, which is rotated to keep only
+    the most recent dumps.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, threshold: Optional[float] = None,
+                 directory: Optional[str] = None, keep: Optional[int] = None):
+        self.enabled = Config.PROFILE_ENABLED if enabled is None else enabled
+        self.threshold = Config.PROFILE_THRESHOLD if threshold is None else threshold
+        # Absolute so Flask's send_file does not resolve it against the app root
+        self.directory = os.path.abspath(directory or Config.PROFILE_DIR)
+        self.keep = Config.PROFILE_KEEP if keep is None else keep
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def cycle(self, name: str = "scheduled"):
+        """Trace and profile the enclosed polling cycle"""
+        if not self.enabled:
+            yield None
+            return
+
+        trace = CycleTrace(name)
+        profiler = cProfile.Profile()
+        _local.trace = trace
+        profiler.enable()
+        try:
+            yield trace
+        finally:
+            profiler.disable()
+            _local.trace = None
+            elapsed = trace.elapsed()
+            if elapsed >= self.threshold:
+                logger.warning(f"Slow {name} cycle took {elapsed:.2f}s, writing profile")
+                try:
+                    self._dump(trace, profiler)
+                except OSError as e:
+                    logger.error(f"Failed to write cycle profile: {e}")
+
+    def _dump(self, trace: CycleTrace, profiler: cProfile.Profile):
+        stamp = trace.started_at.strftime('%Y%m%dT%H%M%S%f')
+        base = os.path.join(self.directory, f"{stamp}-{trace.name}")
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            profiler.dump_stats(f"{base}.prof")
+            with open(f"{base}.txt", 'w') as f:
+                stats = pstats.Stats(profiler, stream=f)
+                stats.sort_stats('cumulative').print_stats(50)
+            with open(f"{base}.json", 'w') as f:
+                json.dump(trace.to_dict(), f, indent=2)
+            self._rotate()
+
+    def _rotate(self):
+        dumps = sorted({os.path.splitext(name)[0] for name in os.listdir(self.directory)})
+        for stale in dumps[:-self.keep] if self.keep > 0 else []:
+            for ext in ('.prof', '.txt', '.json'):
+                path = os.path.join(self.directory, stale + ext)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def list_profiles(self) -> List[Dict]:
+        """Return the stored dumps, most recent first"""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    trace = json.load(f)
+            except (OSError, ValueError):
+                continue
+            profiles.append({
+                "id": name[:-len('.json')],
+                "cycle": trace.get("cycle"),
+                "started_at": trace.get("started_at"),
+                "duration_ms": trace.get("duration_ms"),
+            })
+        return profiles
+
+    def profile_path(self, profile_id: str, ext: str) -> Optional[str]:
+        """Resolve a stored dump file, rejecting anything outside the directory"""
+        if ext not in ('.prof', '.txt', '.json') or os.path.basename(profile_id) != profile_id:
+            return None
+        path = os.path.join(self.directory, profile_id + ext)
+        return path if os.path.isfile(path) else None
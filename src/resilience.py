@@ -0,0 +1,197 @@
+"""Circuit breakers and adaptive timeouts for external dependencies"""
+
+import logging
+import math
+import sys
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import requests
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the dependency's circuit is open"""
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures of a dependency and fails fast while it is down.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected for ``reset_timeout`` seconds. The circuit then goes
+    half-open and lets a single probe through: success closes it again,
+    failure re-opens it for another ``reset_timeout``.
+    """
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None,
+                 reset_timeout: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or Config.CIRCUIT_RESET_TIMEOUT
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed right now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                logger.info(f"Circuit for {self.name} half-open, probing")
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def is_open(self) -> bool:
+        """Return whether calls are currently being rejected, without claiming a probe"""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self.opened_at < self.reset_timeout
+            return self.state == HALF_OPEN and self._probe_in_flight
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release(self):
+        """Give up a half-open probe without changing the circuit's state"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures}
+
+
+class AdaptiveTimeout:
+    """Derives a request timeout from recently observed latencies.
+
+    The timeout is the chosen latency percentile times a safety multiplier,
+    clamped to ``[minimum, maximum]``. Until enough samples are collected
+    the maximum is used.
+    """
+
+    def __init__(self, minimum: Optional[float] = None, maximum: Optional[float] = None,
+                 percentile: float = 0.99, multiplier: float = 3.0, window: int = 200,
+                 min_samples: int = 20):
+        self.minimum = minimum or Config.TIMEOUT_MIN
+        self.maximum = maximum or Config.TIMEOUT_MAX
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, latency: float):
+        with self._lock:
+            self._samples.append(latency)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(percentile * len(ordered)) - 1))
+        return ordered[index]
+
+    def current(self) -> float:
+        with self._lock:
+            enough = len(self._samples) >= self.min_samples
+        if not enough:
+            return self.maximum
+        observed = self.latency_percentile(self.percentile) * self.multiplier
+        return min(self.maximum, max(self.minimum, observed))
+
+
+def _is_dependency_failure(error: Exception) -> bool:
+    """Only timeouts, connection errors, 429s and 5xx mean the dependency is unhealthy"""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, requests.exceptions.RequestException)
+
+
+class Dependency:
+    """Guards calls to an external service with a circuit breaker and adaptive timeout"""
+
+    def __init__(self, name: str, breaker: Optional[CircuitBreaker] = None,
+                 timeout: Optional[AdaptiveTimeout] = None):
+        self.name = name
+        self.breaker = breaker or CircuitBreaker(name)
+        self.timeout = timeout or AdaptiveTimeout()
+
+    def call(self, func: Callable[[float], requests.Response]) -> requests.Response:
+        """Invoke ``func(timeout)``, raising CircuitOpenError if the circuit is open.
+
+        ``func`` should raise for error statuses (``raise_for_status``) so
+        that 429s and 5xx count against the circuit.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+
+        # Half-open probes get the full timeout so a dependency that slowed
+        # down past the adapted timeout can still close the circuit
+        probing = self.breaker.state == HALF_OPEN
+        timeout = self.timeout.maximum if probing else self.timeout.current()
+        start = time.monotonic()
+        try:
+            response = func(timeout)
+        except Exception as e:
+            if isinstance(e, requests.exceptions.Timeout):
+                # Count the timeout as a slow sample so the timeout can grow back
+                self.timeout.observe(max(time.monotonic() - start, timeout))
+            if _is_dependency_failure(e):
+                self.breaker.record_failure()
+            elif isinstance(e, requests.exceptions.HTTPError):
+                # Any other HTTP error status still means the dependency answered
+                self.breaker.record_success()
+            else:
+                # A bug in the caller says nothing about the dependency's health
+                self.breaker.release()
+            raise
+        self.timeout.observe(time.monotonic() - start)
+        self.breaker.record_success()
+        return response
+
+    def status(self) -> Dict:
+        status = self.breaker.status()
+        p50 = self.timeout.latency_percentile(0.5)
+        p99 = self.timeout.latency_percentile(0.99)
+        status.update({
+            "timeout_seconds": round(self.timeout.current(), 3),
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+        })
+        return status
@@ -12,6 +12,8 @@ from typing import List, Dict, Optional
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import Config
+from profiling import span
+from resilience import CircuitOpenError, Dependency
 
 logger = logging.getLogger(__name__)
 
@@ -19,39 +21,44 @@ logger = logging.getLogger(__name__)
 class RSSService:
     """Service for parsing Keepa RSS feeds"""
     
-    def __init__(self, rss_url: Optional[str] = None):
+    def __init__(self, rss_url: Optional[str] = None, dependency: Optional[Dependency] = None):
         self.rss_url = rss_url or Config.KEEPA_RSS_URL
+        self.dependency = dependency or Dependency('keepa')
     
     def parse_keepa_rss(self) -> List[Dict]:
         """Parse Keepa RSS feed and return list of alerts"""
         try:
-            response = requests.get(self.rss_url, timeout=30)
-            response.raise_for_status()
+            with span("fetch", url=self.rss_url):
+                response = self.dependency.call(self._fetch)
             
-            # Parse XML using ElementTree
-            root = ET.fromstring(response.content)
-            
-            alerts = []
-            
-            # Find all entry items
-            for entry in root.findall('.//item'):
-                # Extract image URL from description or enclosure
-                image_url = self._extract_image_url(entry)
+            with span("parse", bytes=len(response.content)):
+                # Parse XML using ElementTree
+                root = ET.fromstring(response.content)
+                
+                alerts = []
                 
-                alert = {
-                    'id': entry.findtext('link', ''),
-                    'title': entry.findtext('title', ''),
-                    'link': entry.findtext('link', ''),
-                    'description': entry.findtext('description', ''),
-                    'published': entry.findtext('pubDate', ''),
-                    'price': self._extract_price_from_title(entry.findtext('title', '')),
-                    'image_url': image_url
-                }
-                alerts.append(alert)
+                # Find all entry items
+                for entry in root.findall('.//item'):
+                    # Extract image URL from description or enclosure
+                    image_url = self._extract_image_url(entry)
+                    
+                    alert = {
+                        'id': entry.findtext('link', ''),
+                        'title': entry.findtext('title', ''),
+                        'link': entry.findtext('link', ''),
+                        'description': entry.findtext('description', ''),
+                        'published': entry.findtext('pubDate', ''),
+                        'price': self._extract_price_from_title(entry.findtext('title', '')),
+                        'image_url': image_url
+                    }
+                    alerts.append(alert)
             
             logger.info(f"Found {len(alerts)} alerts in RSS feed")
             return alerts
         
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping RSS fetch: {e}")
+            return []
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch RSS feed: {e}")
             return []
@@ -62,6 +69,12 @@ class RSSService:
             logger.error(f"Error parsing RSS feed: {e}")
             return []
     
+    def _fetch(self, timeout: float) -> requests.Response:
+        """Fetch the raw RSS feed within the given timeout"""
+        response = requests.get(self.rss_url, timeout=timeout)
+        response.raise_for_status()
+        return response
+    
     def _extract_price_from_title(self, title: str) -> str:
         """Extract price information from title"""
         # Look for price patterns like $19.99, €19.99, £19.99, etc.
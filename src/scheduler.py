@@ -0,0 +1,134 @@
+"""Per-feed polling schedule that can be re-planned while running"""
+
+import logging
+import sys
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from feed_config import FeedConfig, RuntimeConfig
+from rss_service import RSSService
+from slack_service import SlackService
+
+logger = logging.getLogger(__name__)
+
+
+class FeedScheduler:
+    """Holds the active configuration and decides which feeds are due.
+
+    ``apply`` swaps in a new configuration atomically. Feeds whose settings
+    are unchanged keep their schedule, and feeds and routes keep their
+    services (and with them circuit breaker and latency state) as long as
+    their URL is unchanged. Callers that already took a snapshot of a feed
+    and its services finish with those, so reloads never disrupt a poll.
+    """
+
+    def __init__(self, config: RuntimeConfig):
+        self._lock = threading.Lock()
+        self.config: Optional[RuntimeConfig] = None
+        self._feeds: Dict[str, FeedConfig] = {}
+        self._rss_services: Dict[str, RSSService] = {}
+        self._slack_services: Dict[str, SlackService] = {}
+        self._last_run: Dict[str, float] = {}
+        self._next_run: Dict[str, float] = {}
+        self.apply(config)
+
+    def apply(self, config: RuntimeConfig) -> List[str]:
+        """Swap in a new configuration and return the names of re-planned feeds"""
+        with self._lock:
+            old_feeds = self._feeds
+            feeds = {feed.name: feed for feed in config.feeds}
+
+            rss_services = {}
+            next_run = {}
+            replanned = []
+            for name, feed in feeds.items():
+                old = old_feeds.get(name)
+                if old is not None and old.url == feed.url:
+                    rss_services[name] = self._rss_services[name]
+                else:
+                    rss_services[name] = RSSService(feed.url)
+
+                if old == feed:
+                    next_run[name] = self._next_run[name]
+                else:
+                    last_run = self._last_run.get(name)
+                    next_run[name] = 0.0 if last_run is None else last_run + feed.poll_interval
+                    replanned.append(name)
+
+            slack_services = {}
+            for route in config.routes.values():
+                slack_services[route.webhook_url] = (
+                    self._slack_services.get(route.webhook_url) or SlackService(route.webhook_url)
+                )
+
+            self.config = config
+            self._feeds = feeds
+            self._rss_services = rss_services
+            self._slack_services = slack_services
+            self._next_run = next_run
+            self._last_run = {name: ran for name, ran in self._last_run.items() if name in feeds}
+
+        removed = sorted(set(old_feeds) - set(feeds))
+        if old_feeds and (replanned or removed):
+            logger.info(f"Configuration applied: re-planned {replanned or 'no feeds'}, removed {removed or 'no feeds'}")
+        return replanned
+
+    def services_for(self, feed: FeedConfig) -> Optional[Tuple[RSSService, SlackService]]:
+        """Return the fetcher and notifier for a feed in the active configuration.
+
+        Returns None for a feed from an earlier snapshot that a reload has
+        since removed, so callers can skip it instead of failing.
+        """
+        with self._lock:
+            current = self._feeds.get(feed.name)
+            if current is None:
+                return None
+            webhook_url = self.config.route_for(current).webhook_url
+            return self._rss_services[current.name], self._slack_services[webhook_url]
+
+    def notifiers(self) -> List[SlackService]:
+        """Return the notifier of every configured route"""
+        with self._lock:
+            return list(self._slack_services.values())
+
+    def feeds(self) -> List[FeedConfig]:
+        with self._lock:
+            return list(self._feeds.values())
+
+    def due(self, now: Optional[float] = None) -> List[FeedConfig]:
+        """Return the feeds whose next run time has passed"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return [feed for name, feed in self._feeds.items() if self._next_run[name] <= now]
+
+    def mark_ran(self, feed: FeedConfig, now: Optional[float] = None):
+        """Record a completed poll and plan the feed's next run"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            current = self._feeds.get(feed.name)
+            if current is None:
+                return
+            self._last_run[feed.name] = now
+            self._next_run[feed.name] = now + current.poll_interval
+
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if not self._next_run:
+                return float(self.config.poll_interval)
+            return max(0.0, min(self._next_run.values()) - now)
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                "feeds": {name: service.dependency.status() for name, service in self._rss_services.items()},
+                "routes": {
+                    route.name: self._slack_services[route.webhook_url].dependency.status()
+                    for route in self.config.routes.values()
+                }
+            }
@@ -4,21 +4,34 @@ import requests
 import logging
 import sys
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import Config
+from mrkdwn import escape_url, html_to_mrkdwn
+from resilience import CircuitOpenError, Dependency
 
 logger = logging.getLogger(__name__)
 
+# Maximum length Slack accepts for a section block's text
+SECTION_TEXT_LIMIT = 3000
+
+# Titles in a digest are shortened to this many characters
+DIGEST_TITLE_LENGTH = 80
+
 
 class SlackService:
     """Service for sending notifications to Slack"""
     
-    def __init__(self, webhook_url: Optional[str] = None):
+    def __init__(self, webhook_url: Optional[str] = None, dependency: Optional[Dependency] = None):
         self.webhook_url = webhook_url or Config.SLACK_WEBHOOK_URL
+        self.dependency = dependency or Dependency('slack')
+    
+    def is_available(self) -> bool:
+        """Return False while Slack's circuit is open and posts would be rejected"""
+        return not self.dependency.breaker.is_open()
     
     def send_notification(self, title: str, link: str, price: str, description: str = "", image_url: str = None) -> bool:
         """Send notification to Slack"""
@@ -79,11 +92,8 @@ class SlackService:
             })
         
         # Add description if available
-        if description and len(description.strip()) > 0:
-            clean_desc = description.strip()
-            if len(clean_desc) > 300:
-                clean_desc = clean_desc[:300] + "..."
-            
+        clean_desc = html_to_mrkdwn(description, max_length=300) if description else ""
+        if clean_desc:
             payload["blocks"].append({
                 "type": "section",
                 "text": {
@@ -118,11 +128,79 @@ class SlackService:
             ]
         })
         
-        try:
-            response = requests.post(self.webhook_url, json=payload, timeout=30)
-            response.raise_for_status()
+        if self._post(payload):
             logger.info(f"Successfully sent Slack notification for: {title}")
             return True
+        return False
+    
+    def send_digest(self, alerts: List[Dict], remaining: int = 0) -> bool:
+        """Send several alerts as a single compact digest message.
+        
+        ``remaining`` is the number of further alerts held back for the next
+        check; it is only mentioned in the message.
+        """
+        if not self.webhook_url:
+            logger.error("Slack webhook URL not configured")
+            return False
+        if not alerts:
+            return True
+        
+        lines = []
+        for alert in alerts:
+            url = escape_url(alert['link'])
+            price = alert.get('price')
+            suffix = f" — {price}" if price and price != "Price not specified" else ""
+            # Shorten the title, never the rendered line, so the link stays intact
+            room = SECTION_TEXT_LIMIT - len(f"• <{url}|>{suffix}")
+            if room < DIGEST_TITLE_LENGTH:
+                url, room = None, SECTION_TEXT_LIMIT - len(f"• {suffix}")
+            title = html_to_mrkdwn(alert['title'], max_length=min(DIGEST_TITLE_LENGTH, room - 3))
+            title = title or "Untitled alert"
+            lines.append(f"• <{url}|{title}>{suffix}" if url else f"• {title}{suffix}")
+        if remaining:
+            lines.append(f"…and {remaining} more in the next check")
+        
+        # Slack rejects section text over 3000 characters, so spread the
+        # lines over as many sections as needed
+        sections = [f"*🛒 {len(alerts)} more Keepa alerts*"]
+        for line in lines:
+            if len(sections[-1]) + 1 + len(line) > SECTION_TEXT_LIMIT:
+                sections.append(line)
+            else:
+                sections[-1] += "\n" + line
+        
+        payload = {
+            "text": f"🛒 Keepa Alerts digest: {len(alerts)} alerts",
+            "blocks": [
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": text
+                    }
+                }
+                for text in sections
+            ]
+        }
+        
+        if self._post(payload):
+            logger.info(f"Successfully sent Slack digest of {len(alerts)} alerts")
+            return True
+        return False
+    
+    def _post(self, payload: Dict) -> bool:
+        """Post a payload to the webhook through the Slack circuit breaker"""
+        def post(timeout: float) -> requests.Response:
+            response = requests.post(self.webhook_url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            return response
+        
+        try:
+            self.dependency.call(post)
+            return True
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping Slack notification: {e}")
+            return False
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to send Slack notification: {e}")
             return False
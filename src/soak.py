@@ -0,0 +1,320 @@
+"""Load and soak test mode against simulated Keepa RSS feeds and Slack.
+
+Starts a local HTTP server, in a separate process, that serves churning
+Keepa-style RSS feeds and a Slack webhook that injects latency, 429s and
+5xx errors, then drives the real scheduler, RSSService and SlackService
+against it and reports throughput, latency percentiles, memory growth and
+duplicate/lost alerts.
+
+Usage:
+    python src/soak.py --feeds 200 --items-per-hour 5000 --duration 3600
+"""
+
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import re
+import resource
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from urllib.request import urlopen
+from xml.sax.saxutils import escape
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main as service
+from feed_config import FeedConfig, Route, RuntimeConfig
+
+logger = logging.getLogger(__name__)
+
+ITEM_URL = 'https://sim.keepa.local/item/'
+ITEM_LINK_RE = re.compile(re.escape(ITEM_URL) + r'[\w/-]+')
+
+
+class SimulatedFeed:
+    """A Keepa feed that publishes items at a fixed rate and shows the latest ones"""
+
+    def __init__(self, index: int, rate: float, window: int, started: float):
+        self.index = index
+        self.rate = rate  # items per second
+        self.phase = random.random()
+        self.started = started
+        self.generated = 0
+        self.items = deque(maxlen=window)
+
+    def catch_up(self, now: float, created: Dict[str, float]):
+        """Publish every item due by ``now``, recording when each appeared"""
+        due = math.floor((now - self.started) * self.rate + self.phase)
+        while self.generated < due:
+            link = f"{ITEM_URL}{self.index}/{self.generated}"
+            created[link] = self.started + (self.generated + 1 - self.phase) / self.rate
+            # Roughly a third of Keepa alerts have no price in the title
+            price = f" - ${random.randint(5, 500)}.99" if self.generated % 3 else ""
+            self.items.append((link, f"Simulated product {self.index}-{self.generated}{price}"))
+            self.generated += 1
+
+    def render(self) -> bytes:
+        items = []
+        for link, title in reversed(self.items):
+            description = (
+                f'<p><img src="https://images.sim.keepa.local/{self.index}.jpg"/>'
+                f'Price drop &amp; deal for <b>{escape(title)}</b></p>'
+            )
+            items.append(
+                f"<item><title>{escape(title)}</title><link>{link}</link>"
+                f"<description>{escape(description)}</description>"
+                f"<pubDate>{time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime())}</pubDate></item>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Simulated feed {self.index}</title>{''.join(items)}</channel></rss>"
+        ).encode('utf-8')
+
+
+class Simulator:
+    """Shared state of the simulated Keepa and Slack endpoints"""
+
+    def __init__(self, feeds: int, items_per_hour: float, window: int, slack_latency: float,
+                 slack_429_rate: float, slack_5xx_rate: float):
+        self.started = time.monotonic()
+        rate = items_per_hour / 3600.0 / feeds
+        self.feeds = [SimulatedFeed(index, rate, window, self.started) for index in range(feeds)]
+        self.slack_latency = slack_latency
+        self.slack_429_rate = slack_429_rate
+        self.slack_5xx_rate = slack_5xx_rate
+        self.created: Dict[str, float] = {}
+        self.deliveries: Dict[str, int] = {}
+        self.latencies: List[float] = []
+        self.slack_requests = {"ok": 0, "429": 0, "5xx": 0}
+        self.lock = threading.Lock()
+
+    def feed_xml(self, index: int) -> Optional[bytes]:
+        if not 0 <= index < len(self.feeds):
+            return None
+        with self.lock:
+            feed = self.feeds[index]
+            feed.catch_up(time.monotonic(), self.created)
+            return feed.render()
+
+    def slack_post(self, body: bytes) -> int:
+        """Handle a webhook post and return the HTTP status to answer with"""
+        if self.slack_latency:
+            time.sleep(random.expovariate(1.0 / self.slack_latency))
+
+        roll = random.random()
+        with self.lock:
+            if roll < self.slack_429_rate:
+                self.slack_requests["429"] += 1
+                return 429
+            if roll < self.slack_429_rate + self.slack_5xx_rate:
+                self.slack_requests["5xx"] += 1
+                return 503
+            self.slack_requests["ok"] += 1
+
+            now = time.monotonic()
+            # A notification links its item several times, a digest once per item
+            for link in set(ITEM_LINK_RE.findall(body.decode('utf-8', 'replace'))):
+                self.deliveries[link] = self.deliveries.get(link, 0) + 1
+                if self.deliveries[link] == 1 and link in self.created:
+                    self.latencies.append(now - self.created[link])
+        return 200
+
+    def finish(self, grace: float) -> Dict:
+        """Publish outstanding items and tally delivery results"""
+        with self.lock:
+            now = time.monotonic()
+            for feed in self.feeds:
+                feed.catch_up(now, self.created)
+            cutoff = now - grace
+            settled = [link for link, created in self.created.items() if created <= cutoff]
+            return {
+                "items_published": len(self.created),
+                "alerts_delivered": len(self.deliveries),
+                "duplicate_alerts": sum(1 for count in self.deliveries.values() if count > 1),
+                "lost_alerts": sum(1 for link in settled if link not in self.deliveries),
+                "pending_alerts": sum(
+                    1 for link, created in self.created.items()
+                    if created > cutoff and link not in self.deliveries
+                ),
+                "delivery_latency_seconds": percentiles(self.latencies),
+                "slack_responses": dict(self.slack_requests),
+            }
+
+
+def make_handler(simulator: Simulator):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path in ('/stats', '/finish'):
+                if url.path == '/stats':
+                    with simulator.lock:
+                        result = {"alerts_delivered": len(simulator.deliveries)}
+                else:
+                    result = simulator.finish(grace=float(parse_qs(url.query).get('grace', ['0'])[0]))
+                self._reply(200, json.dumps(result).encode('utf-8'), 'application/json')
+                return
+
+            match = re.fullmatch(r'/feed/(\d+)', self.path)
+            body = simulator.feed_xml(int(match.group(1))) if match else None
+            if body is None:
+                self.send_error(404)
+                return
+            self._reply(200, body, 'application/rss+xml')
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            status = simulator.slack_post(body)
+            self._reply(status, b'ok' if status == 200 else b'simulated failure', 'text/plain')
+
+        def _reply(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '1')
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def percentiles(samples: List[float]) -> Dict:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, max(0, math.ceil(p * len(ordered)) - 1))], 3)
+
+    return {"count": len(ordered), "p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99), "max": pick(1.0)}
+
+
+def rss_megabytes() -> float:
+    """Current resident set size, falling back to the peak where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def serve_simulator(args, ports: multiprocessing.Queue):
+    """Run the simulated Keepa and Slack endpoints until the process is terminated"""
+    simulator = Simulator(args.feeds, args.items_per_hour, args.window, args.slack_latency_ms / 1000.0,
+                          args.slack_429_rate, args.slack_5xx_rate)
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(simulator))
+    server.daemon_threads = True
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+def fetch_json(url: str) -> Dict:
+    with urlopen(url, timeout=60) as response:
+        return json.load(response)
+
+
+def run_soak(args) -> Dict:
+    # The simulator runs in its own process so its bookkeeping does not
+    # count towards the service's memory growth
+    ports = multiprocessing.Queue()
+    simulator = multiprocessing.Process(target=serve_simulator, args=(args, ports), daemon=True)
+    simulator.start()
+    base = f"http://127.0.0.1:{ports.get(timeout=30)}"
+    logger.warning(f"Simulator listening on {base}")
+
+    service.config_watcher = None
+    service.feed_scheduler.apply(RuntimeConfig(
+        poll_interval=args.poll_interval,
+        feeds=tuple(
+            FeedConfig(name=f"sim-{index}", url=f"{base}/feed/{index}", poll_interval=args.poll_interval)
+            for index in range(args.feeds)
+        ),
+        routes={'default': Route(name='default', webhook_url=f"{base}/slack")}
+    ))
+    scheduler = threading.Thread(target=service.run_scheduled_check, daemon=True)
+    scheduler.start()
+
+    started = time.monotonic()
+    memory = [(0.0, rss_megabytes())]
+    try:
+        while time.monotonic() - started < args.duration:
+            time.sleep(min(args.report_interval, max(0.0, args.duration - (time.monotonic() - started))))
+            elapsed = time.monotonic() - started
+            memory.append((elapsed, rss_megabytes()))
+            delivered = fetch_json(f"{base}/stats")["alerts_delivered"]
+            logger.warning(
+                f"[{elapsed:.0f}s] delivered={delivered} sent_alerts={len(service.sent_alerts)} "
+                f"rss={memory[-1][1]:.1f}MB"
+            )
+
+        elapsed = time.monotonic() - started
+        # Let the in-flight poll finish before the simulator goes away
+        service.scheduler_stop.set()
+        scheduler.join()
+        dependencies = service.feed_scheduler.status()
+        report = fetch_json(f"{base}/finish?grace={2 * args.poll_interval + 30}")
+    finally:
+        service.scheduler_stop.set()
+        simulator.terminate()
+        simulator.join()
+
+    report.update({
+        "duration_seconds": round(elapsed, 1),
+        "feeds": args.feeds,
+        "throughput_alerts_per_hour": round(report["alerts_delivered"] / elapsed * 3600, 1),
+        "memory_mb": {
+            "start": round(memory[0][1], 1),
+            "end": round(memory[-1][1], 1),
+            "growth_per_hour": round((memory[-1][1] - memory[0][1]) / elapsed * 3600, 2),
+        },
+        "sent_alerts_tracked": len(service.sent_alerts),
+        "feed_circuits": dict(Counter(status["state"] for status in dependencies["feeds"].values())),
+        "slack_routes": dependencies["routes"],
+    })
+    return report
+
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description='Soak test the alert service against simulated Keepa and Slack')
+    parser.add_argument('--feeds', type=int, default=100, help='Number of simulated feeds')
+    parser.add_argument('--items-per-hour', type=float, default=2000, help='New items per hour across all feeds')
+    parser.add_argument('--window', type=int, default=20, help='Items shown per feed response')
+    parser.add_argument('--poll-interval', type=int, default=60, help='Seconds between polls of each feed')
+    parser.add_argument('--duration', type=float, default=3600, help='Test length in seconds')
+    parser.add_argument('--report-interval', type=float, default=60, help='Seconds between progress lines')
+    parser.add_argument('--slack-latency-ms', type=float, default=150, help='Mean simulated Slack latency')
+    parser.add_argument('--slack-429-rate', type=float, default=0.02, help='Fraction of Slack posts rate limited')
+    parser.add_argument('--slack-5xx-rate', type=float, default=0.01, help='Fraction of Slack posts failing')
+    parser.add_argument('--port', type=int, default=0, help='Simulator port (0 picks a free port)')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    parser.add_argument('--log-level', default='WARNING', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    args = parser.parse_args(argv)
+    for option in ('feeds', 'items_per_hour', 'poll_interval', 'duration', 'report_interval'):
+        if getattr(args, option) <= 0:
+            parser.error(f"--{option.replace('_', '-')} must be positive")
+
+    logging.getLogger().setLevel(getattr(logging, args.log_level))
+
+    report = run_soak(args)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+
+if __name__ == '__main__':
+    cli()
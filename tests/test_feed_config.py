@@ -0,0 +1,71 @@
+"""Tests for feed configuration parsing and validation"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from feed_config import ConfigError, ConfigWatcher, parse_config
+
+ROUTES = {'default': {'webhook_url': 'https://hooks.example.com/a'}}
+
+
+def config(**overrides):
+    data = {'routes': ROUTES, 'feeds': [{'name': 'main', 'url': 'https://rss.keepa.com/x'}]}
+    data.update(overrides)
+    return data
+
+
+def test_parses_feeds_routes_and_rules():
+    parsed = parse_config(config(
+        poll_interval=120,
+        feeds=[
+            {'name': 'main', 'url': 'https://rss.keepa.com/x'},
+            {'name': 'lego', 'url': 'https://rss.keepa.com/y', 'poll_interval': 60,
+             'rules': {'include': ['LEGO'], 'exclude': 'refurbished'}},
+            {'name': 'off', 'url': 'https://rss.keepa.com/z', 'enabled': False},
+        ]
+    ))
+    assert [feed.name for feed in parsed.feeds] == ['main', 'lego']
+    assert parsed.feeds[0].poll_interval == 120
+    assert parsed.feeds[1].poll_interval == 60
+    assert parsed.feeds[1].rules.matches('Lego Star Wars')
+    assert not parsed.feeds[1].rules.matches('Lego set (Refurbished)')
+    assert not parsed.feeds[1].rules.matches('Duplo')
+    assert parsed.route_for(parsed.feeds[0]).webhook_url == 'https://hooks.example.com/a'
+
+
+@pytest.mark.parametrize('data, message', [
+    ([], 'configuration must be a mapping'),
+    (config(feeds=[]), 'feeds must be a non-empty list'),
+    (config(feeds=[{'url': 'https://rss.keepa.com/x'}]), 'name is required'),
+    (config(feeds=[{'name': 'a', 'url': 'ftp://x'}]), 'url must be an http(s) URL'),
+    (config(feeds=[{'name': 'a', 'url': 'https://x'}, {'name': 'a', 'url': 'https://y'}]),
+     "feed 'a' is defined more than once"),
+    (config(feeds=[{'name': 'a', 'url': 'https://x', 'route': 'nope'}]), "unknown route 'nope'"),
+    (config(feeds=[{'name': 'a', 'url': 'https://x', 'poll_interval': 5}]), 'at least 30 seconds'),
+    (config(poll_interval='often'), 'poll_interval must be a number'),
+    (config(feeds=[{'name': 'a', 'url': 'https://x', 'rules': {'include': [1]}}]), 'rules.include'),
+    (config(routes={'default': {'webhook_url': 'http://insecure'}}), 'webhook_url must be an https URL'),
+    (config(routes={'default': {'webhook_url_env': 'KEEPA_TEST_UNSET_WEBHOOK'}}),
+     'KEEPA_TEST_UNSET_WEBHOOK is not set'),
+])
+def test_rejects_invalid_configuration(data, message):
+    with pytest.raises(ConfigError, match=message.replace('(', r'\(').replace(')', r'\)')):
+        parse_config(data)
+
+
+def test_watcher_ignores_invalid_changes(tmp_path):
+    path = tmp_path / 'feeds.json'
+    path.write_text(json.dumps(config()))
+    watcher = ConfigWatcher(str(path))
+    assert watcher.load().feeds[0].name == 'main'
+    assert watcher.poll() is None
+
+    path.write_text('{not json')
+    assert watcher.poll() is None
+
+    path.write_text(json.dumps(config(feeds=[{'name': 'other', 'url': 'https://rss.keepa.com/y'}])))
+    assert watcher.poll().feeds[0].name == 'other'
@@ -0,0 +1,125 @@
+"""Tests for the alert check and scheduler loop"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import main
+from feed_config import FeedConfig, Route, RuntimeConfig, default_config
+from rss_service import RSSService
+from scheduler import FeedScheduler
+from slack_service import SlackService
+
+
+class StopAfterOneCycle(threading.Event):
+    """Stops run_scheduled_check at its first wait"""
+
+    def wait(self, timeout=None):
+        self.set()
+        return True
+
+
+def alert(link, title='Product', price='$9.99'):
+    return {'id': link, 'title': title, 'link': link, 'price': price, 'description': '', 'image_url': None}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Route feeds to fake items and record what would be posted to Slack"""
+    items = {}
+    fetched = []
+    posted = []
+
+    def parse(rss_service):
+        fetched.append(rss_service.rss_url)
+        if isinstance(items.get(rss_service.rss_url), Exception):
+            raise items[rss_service.rss_url]
+        return list(items.get(rss_service.rss_url, []))
+
+    def send_notification(slack_service, title, link, price, description="", image_url=None):
+        posted.append((slack_service.webhook_url, link))
+        return True
+
+    def send_digest(slack_service, alerts, remaining=0):
+        posted.extend((slack_service.webhook_url, 'digest:' + a['link']) for a in alerts)
+        return True
+
+    monkeypatch.setattr(RSSService, 'parse_keepa_rss', parse)
+    monkeypatch.setattr(SlackService, 'send_notification', send_notification)
+    monkeypatch.setattr(SlackService, 'send_digest', send_digest)
+    monkeypatch.setattr(main, 'sent_alerts', set())
+    monkeypatch.setattr(main, 'feed_scheduler', FeedScheduler(default_config()))
+    monkeypatch.setattr(main, 'config_watcher', None)
+    monkeypatch.setattr(main, 'scheduler_stop', StopAfterOneCycle())
+    return items, fetched, posted
+
+
+def apply(*feeds, routes=None):
+    routes = routes or {'default': Route('default', 'https://hooks.example.com/a')}
+    main.feed_scheduler.apply(RuntimeConfig(poll_interval=300, feeds=tuple(feeds), routes=routes))
+
+
+def test_failing_feed_does_not_stop_the_others(service):
+    items, fetched, posted = service
+    items['https://a'] = RuntimeError('broken feed')
+    items['https://b'] = [alert('https://item/1')]
+    apply(FeedConfig('a', 'https://a', 300), FeedConfig('b', 'https://b', 300))
+
+    main.run_scheduled_check()
+
+    assert fetched == ['https://a', 'https://b']
+    assert posted == [('https://hooks.example.com/a', 'https://item/1')]
+    # The failing feed waits for its next regular poll instead of retrying at once
+    assert main.feed_scheduler.due() == []
+
+
+def test_dedup_is_per_webhook_not_per_route_name(service):
+    items, fetched, posted = service
+    items['https://a'] = [alert('https://item/1')]
+    items['https://b'] = [alert('https://item/1')]
+    items['https://c'] = [alert('https://item/1')]
+    apply(
+        FeedConfig('a', 'https://a', 300),
+        FeedConfig('b', 'https://b', 300, route='alias'),
+        FeedConfig('c', 'https://c', 300, route='other'),
+        routes={
+            'default': Route('default', 'https://hooks.example.com/a'),
+            'alias': Route('alias', 'https://hooks.example.com/a'),
+            'other': Route('other', 'https://hooks.example.com/b'),
+        }
+    )
+
+    main.check_and_send_alerts()
+
+    assert sorted(posted) == [
+        ('https://hooks.example.com/a', 'https://item/1'),
+        ('https://hooks.example.com/b', 'https://item/1'),
+    ]
+
+
+def test_watermark_applies_to_backlog_across_feeds(service, monkeypatch):
+    items, fetched, posted = service
+    monkeypatch.setattr(main.Config, 'SHED_WATERMARK', 3)
+    monkeypatch.setattr(main.Config, 'DIGEST_MAX_ITEMS', 2)
+    feeds = []
+    for index in range(6):
+        url = f'https://feed/{index}'
+        # Even feeds carry unpriced alerts, which are shed first
+        price = 'Price not specified' if index % 2 == 0 else '$5.00'
+        items[url] = [alert(f'https://item/{index}', price=price)]
+        feeds.append(FeedConfig(f'f{index}', url, 300))
+    apply(*feeds)
+
+    assert main.check_and_send_alerts() == 5
+
+    assert [link for _, link in posted] == [
+        'https://item/1', 'https://item/3', 'https://item/5',
+        'digest:https://item/0', 'digest:https://item/2',
+    ]
+    # The alert that did not fit in the digest is delivered by the next check
+    posted.clear()
+    assert main.check_and_send_alerts() == 1
+    assert [link for _, link in posted] == ['https://item/4']
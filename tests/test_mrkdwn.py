@@ -0,0 +1,50 @@
+"""Tests for HTML to Slack mrkdwn conversion"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from mrkdwn import html_to_mrkdwn
+
+
+def test_strips_images_and_decodes_entities():
+    html = '<p>Price dropped &euro;5 <img src="https://img/x.jpg"/>today</p><script>alert(1)</script>'
+    assert html_to_mrkdwn(html) == 'Price dropped €5 today'
+
+
+def test_escapes_slack_control_characters():
+    assert html_to_mrkdwn('<p>Tom &amp; Jerry &lt;3</p>') == 'Tom &amp; Jerry &lt;3'
+
+
+def test_keeps_absolute_links_and_escapes_url():
+    html = '<a href="https://amazon.com/dp/1?a=1|2">See &gt; deal</a> <a href="/relative">local</a>'
+    assert html_to_mrkdwn(html) == '<https://amazon.com/dp/1?a=1%7C2|See &gt; deal> local'
+
+
+def test_block_tags_become_single_newlines():
+    assert html_to_mrkdwn('<div>one</div><br/><br/><p>two</p>') == 'one\ntwo'
+
+
+def test_truncates_at_word_boundary():
+    assert html_to_mrkdwn('alpha beta gamma', max_length=12) == 'alpha beta...'
+
+
+def test_truncation_counts_link_urls():
+    html = ' '.join(f'<a href="https://www.amazon.com/dp/B0{i:08d}">b{i}</a>' for i in range(200))
+    result = html_to_mrkdwn(html, max_length=300)
+    assert len(result) <= 303
+    assert result.endswith('>...')
+
+
+def test_oversized_leading_link_falls_back_to_its_text():
+    html = '<a href="https://amazon.com/' + 'x' * 400 + '">Long &amp; link text</a>'
+    assert html_to_mrkdwn(html, max_length=10) == 'Long &amp;...'
+
+
+def test_oversized_word_is_clipped():
+    assert html_to_mrkdwn('a' * 400, max_length=300) == 'a' * 300 + '...'
+
+
+def test_parser_error_falls_back_to_plain_text():
+    assert html_to_mrkdwn('<![foo bar]>x') == '&lt;![foo bar]&gt;x'
+    assert html_to_mrkdwn('<![foo   bar]>  x   y z', max_length=15) == '&lt;![foo...'
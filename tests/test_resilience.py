@@ -0,0 +1,124 @@
+"""Tests for circuit breakers and adaptive timeouts"""
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from resilience import (
+    CLOSED, HALF_OPEN, OPEN, AdaptiveTimeout, CircuitBreaker, CircuitOpenError, Dependency
+)
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(response=response)
+
+
+def fail_with(error):
+    def func(timeout):
+        raise error
+    return func
+
+
+def test_breaker_opens_after_threshold_and_rejects_calls():
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.is_open()
+    assert not breaker.allow()
+
+
+def test_half_open_allows_single_probe_and_closes_on_success():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+
+
+def test_failed_probe_reopens_circuit():
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=0.01)
+    for _ in range(3):
+        breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_adaptive_timeout_uses_maximum_until_enough_samples():
+    timeout = AdaptiveTimeout(minimum=2, maximum=30, min_samples=5)
+    for _ in range(4):
+        timeout.observe(0.01)
+    assert timeout.current() == 30
+    timeout.observe(0.01)
+    assert timeout.current() == 2
+
+
+def test_adaptive_timeout_clamps_to_maximum():
+    timeout = AdaptiveTimeout(minimum=2, maximum=30, min_samples=1)
+    timeout.observe(20)
+    assert timeout.current() == 30
+    timeout = AdaptiveTimeout(minimum=2, maximum=30, min_samples=1)
+    timeout.observe(5)
+    assert timeout.current() == 15
+
+
+def test_timeout_recovers_after_dependency_slows_down():
+    dependency = Dependency(
+        'test',
+        CircuitBreaker('test', failure_threshold=5, reset_timeout=0.01),
+        AdaptiveTimeout(minimum=2, maximum=30, min_samples=20)
+    )
+    for _ in range(50):
+        dependency.call(lambda timeout: 'fast')
+    assert dependency.timeout.current() == 2
+
+    def three_second_dependency(timeout):
+        if timeout < 3:
+            raise requests.exceptions.Timeout()
+        return 'slow'
+
+    for _ in range(40):
+        try:
+            dependency.call(three_second_dependency)
+        except (requests.exceptions.Timeout, CircuitOpenError):
+            pass
+        time.sleep(0.015)
+
+    assert dependency.breaker.state == CLOSED
+    assert dependency.timeout.current() >= 3
+
+
+def test_client_errors_count_as_success_and_server_errors_as_failure():
+    dependency = Dependency('test', CircuitBreaker('test', failure_threshold=1, reset_timeout=60))
+    with pytest.raises(requests.exceptions.HTTPError):
+        dependency.call(fail_with(http_error(404)))
+    assert dependency.breaker.state == CLOSED
+    with pytest.raises(requests.exceptions.HTTPError):
+        dependency.call(fail_with(http_error(503)))
+    assert dependency.breaker.state == OPEN
+
+
+def test_caller_bug_does_not_close_half_open_circuit():
+    dependency = Dependency('test', CircuitBreaker('test', failure_threshold=1, reset_timeout=0.01))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        dependency.call(fail_with(requests.exceptions.ConnectionError()))
+    time.sleep(0.02)
+    with pytest.raises(TypeError):
+        dependency.call(fail_with(TypeError('bug')))
+    assert dependency.breaker.state == HALF_OPEN
+    # The probe was released, so the next call may probe again
+    assert dependency.call(lambda timeout: 'ok') == 'ok'
+    assert dependency.breaker.state == CLOSED
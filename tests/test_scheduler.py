@@ -0,0 +1,53 @@
+"""Tests for per-feed scheduling across configuration reloads"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from feed_config import FeedConfig, Route, RuntimeConfig
+from scheduler import FeedScheduler
+
+ROUTES = {'default': Route('default', 'https://hooks.example.com/a')}
+
+
+def runtime_config(*feeds):
+    return RuntimeConfig(poll_interval=300, feeds=tuple(feeds), routes=dict(ROUTES))
+
+
+def test_new_feeds_are_due_immediately_and_then_every_interval():
+    scheduler = FeedScheduler(runtime_config(FeedConfig('a', 'https://x/a', 300)))
+    assert [feed.name for feed in scheduler.due(100)] == ['a']
+    scheduler.mark_ran(scheduler.due(100)[0], 100)
+    assert scheduler.due(399) == []
+    assert scheduler.seconds_until_next(100) == 300
+    assert [feed.name for feed in scheduler.due(400)] == ['a']
+
+
+def test_apply_keeps_unchanged_feeds_and_replans_changed_ones():
+    a = FeedConfig('a', 'https://x/a', 300)
+    b = FeedConfig('b', 'https://x/b', 300)
+    scheduler = FeedScheduler(runtime_config(a, b))
+    for feed in scheduler.due(100):
+        scheduler.mark_ran(feed, 100)
+    fetcher_a = scheduler.services_for(a)[0]
+    fetcher_b = scheduler.services_for(b)[0]
+
+    replanned = scheduler.apply(runtime_config(
+        a, FeedConfig('b', 'https://x/b', 60), FeedConfig('c', 'https://x/c', 300)
+    ))
+
+    assert replanned == ['b', 'c']
+    assert [feed.name for feed in scheduler.due(200)] == ['b', 'c']
+    assert [feed.name for feed in scheduler.due(400)] == ['a', 'b', 'c']
+    # Services, and with them circuit breaker state, survive while the URL is unchanged
+    assert scheduler.services_for(a)[0] is fetcher_a
+    assert scheduler.services_for(b)[0] is fetcher_b
+
+
+def test_removed_feed_has_no_services():
+    a = FeedConfig('a', 'https://x/a', 300)
+    b = FeedConfig('b', 'https://x/b', 300)
+    scheduler = FeedScheduler(runtime_config(a, b))
+    scheduler.apply(runtime_config(a))
+    assert scheduler.services_for(b) is None
+    assert [feed.name for feed in scheduler.feeds()] == ['a']
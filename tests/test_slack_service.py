@@ -0,0 +1,40 @@
+"""Tests for Slack digest formatting"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from slack_service import SECTION_TEXT_LIMIT, SlackService
+
+
+def capture_digest(alerts, remaining=0):
+    service = SlackService('https://hooks.example.com/x')
+    sent = []
+    service._post = lambda payload: sent.append(payload) or True
+    assert service.send_digest(alerts, remaining=remaining)
+    return sent[0]
+
+
+def test_digest_splits_sections_under_slack_limit():
+    alerts = [
+        {'title': 'T' * 200, 'link': f'https://www.amazon.com/dp/B0{i}?' + 'q' * 60, 'price': '$1.99'}
+        for i in range(30)
+    ]
+    payload = capture_digest(alerts, remaining=12)
+    texts = [block['text']['text'] for block in payload['blocks']]
+    assert len(texts) > 1
+    assert all(len(text) <= SECTION_TEXT_LIMIT for text in texts)
+    assert sum(text.count('• <') for text in texts) == 30
+    assert texts[-1].endswith('…and 12 more in the next check')
+
+
+def test_digest_escapes_link_and_keeps_long_lines_intact():
+    alerts = [
+        {'title': 'Deal', 'link': 'https://a.com/x?a=1|b=<2>', 'price': 'Price not specified'},
+        {'title': 'Huge ' * 50, 'link': 'https://a.com/' + 'p' * 2950, 'price': '$5.00'},
+    ]
+    text = '\n'.join(block['text']['text'] for block in capture_digest(alerts)['blocks'])
+    assert '• <https://a.com/x?a=1%7Cb=%3C2%3E|Deal>' in text
+    # A link too long to fit is dropped in favour of the shortened title
+    assert '• Huge Huge' in text and '$5.00' in text
+    assert all(len(block['text']['text']) <= SECTION_TEXT_LIMIT for block in capture_digest(alerts)['blocks'])